@@ -1,5 +1,14 @@
 # bot.py — Fraternity roster bot (Discord) with Excel import → SQLite storage.
 
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
+import json
+import operator
 import os
 import discord
 from discord.ext import commands
@@ -7,8 +16,6 @@ from discord import app_commands
 from discord.ui import View, Select
 from discord import SelectOption
 
-import pandas as pd
-
 import db
 
 # ---------- CONFIG ----------
@@ -16,50 +23,170 @@ TOKEN = os.environ.get("DISCORD_TOKEN")
 GUILD_ID = os.environ.get("GUILD_ID")  # optional; set to force instant guild sync
 
 # Officer roles allowed to modify roster
-OFFICER_ROLES = {"President", "PD"}  # exact role names
+OFFICER_ROLES = frozenset({"President", "PD"})  # exact role names
 
 # Intents (Message Content not required for slash commands)
 intents = discord.Intents.default()
 intents.guilds = True
 intents.members = True
-bot = commands.Bot(command_prefix=commands.when_mentioned, intents=intents)
+class RosterBot(commands.Bot):
+    async def setup_hook(self):
+        # Runs once per process before any command can fire (on_ready fires
+        # again on every reconnect, so schema init does not belong there).
+        await asyncio.to_thread(db.init_db)
+        # Round-trip to Discord now so the HTTP session's TLS connection is
+        # established before the first interaction has to pay for it.
+        try:
+            await self.application_info()
+        except Exception as e:
+            print("REST pre-warm failed:", e)
+
+bot = RosterBot(command_prefix=commands.when_mentioned, intents=intents)
 
 # ---------- PERMISSIONS ----------
+# Officer role IDs per guild, resolved from OFFICER_ROLES names on first use
+# so the per-interaction check is an integer membership scan — no tuple of
+# role names built per call. Role IDs differ between guilds, so the cache is
+# keyed by guild id and an entry is dropped when that guild's roles change.
+_officer_role_ids: dict[int, frozenset[int]] = {}
+
 def officer_only(interaction: discord.Interaction) -> bool:
+    if interaction.guild is None:
+        return False
     if interaction.user.guild_permissions.administrator:
         return True
-    role_names = {r.name for r in getattr(interaction.user, "roles", [])}
-    return bool(OFFICER_ROLES & role_names)
-
-async def is_pd_or_president(interaction: discord.Interaction) -> bool:
-    return officer_only(interaction)
+    ids = _officer_role_ids.get(interaction.guild_id)
+    if ids is None:
+        ids = _officer_role_ids[interaction.guild_id] = frozenset(
+            r.id for r in interaction.guild.roles if r.name in OFFICER_ROLES)
+    for r in interaction.user.roles:
+        if r.id in ids:
+            return True
+    return False
+
+def officer_check():
+    """app_commands.check wrapper: rejects non-officers before the handler
+    (and its defer) ever runs. CheckFailure is mapped to the friendly
+    "Officers only" reply in on_app_command_error."""
+    return app_commands.check(officer_only)
+
+# ---------- UTIL: defer before DB work ----------
+# Discord voids an interaction after 3s; a cold SQLite connection or a busy
+# event loop can blow that. Ack immediately, then answer via followup.send.
+def defer_first(ephemeral: bool = True):
+    def wrap(fn):
+        @functools.wraps(fn)
+        async def inner(interaction: discord.Interaction, *args, **kwargs):
+            await interaction.response.defer(ephemeral=ephemeral)
+            return await fn(interaction, *args, **kwargs)
+        return inner
+    return wrap
 
 # ---------- UTIL: colored line formatter ----------
 # ANSI 256 colors: orange ~ 208, light blue ~ 117
+_ANSI_ORANGE = "\x1b[38;5;208m"
+_ANSI_BLUE   = "\x1b[38;5;117m"
+_ANSI_RESET  = "\x1b[0m"
+
+# Memoized: the same (first, nick, last, roll, honor) tuples recur on every
+# render until a member is edited, and edits change the key itself.
+@functools.lru_cache(maxsize=8192)
 def format_member_line_colored(first: str, nick: str, last: str, roll: int, honor: str) -> str:
-    num = f"\x1b[38;5;208m#{roll}\x1b[0m"
-    nn  = f"\x1b[38;5;117m“{nick}”\x1b[0m"
-    return f"{num} {honor} {first} {nn} {last}"
+    return f"{_ANSI_ORANGE}#{roll}{_ANSI_RESET} {honor} {first} {_ANSI_BLUE}“{nick}”{_ANSI_RESET} {last}"
+
+# ---------- UTIL: roster embed builder ----------
+def _iter_roster_embeds(rows):
+    """Yield one finished Embed per class (plus same-title continuations when
+    a class overflows the 5400-char description budget). rows must arrive
+    sorted by class, which db.get_roster guarantees — groupby does the
+    boundary detection in C instead of a per-row Python comparison."""
+    for cls, members in itertools.groupby(rows, key=operator.itemgetter(0)):
+        buf = io.StringIO(); buf.write("```ansi\n"); had_any = False
+        for _, first, nick, last, roll, honor in members:
+            if first is None:
+                continue
+            line = format_member_line_colored(first, nick, last, roll, honor)
+            if had_any and buf.tell() + len(line) + 1 > 5400:
+                buf.write("```")
+                yield discord.Embed(title=cls, description=buf.getvalue())
+                buf = io.StringIO(); buf.write("```ansi\n"); had_any = False
+            buf.write(line)
+            buf.write("\n")
+            had_any = True
+        if not had_any:
+            buf.write("No members yet\n")
+        buf.write("```")
+        yield discord.Embed(title=cls, description=buf.getvalue())
+
+# ---------- REPLY CACHES ----------
+# Rendered /roster and /classes replies are cached keyed by db's data
+# version, which every mutating db call bumps, so any write invalidates.
+_roster_cache: dict[str | None, tuple[int, list[dict]]] = {}
+_classes_cache: tuple[int, str] | None = None
 
 # ---------- EVENTS ----------
+_synced = False  # on_ready re-fires on reconnect; only sync once per process
+
+# Sync hits Discord's heavily rate-limited command endpoint, so persist a
+# hash of the registered tree next to the DB and skip the round trip when
+# nothing changed since the last boot.
+_CMD_HASH_PATH = db.DB_PATH.with_name(".cmd_hash")
+
+def _tree_hash() -> str:
+    payload = sorted((c.to_dict(bot.tree) for c in bot.tree.get_commands()),
+                     key=lambda d: d["name"])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
 @bot.event
 async def on_ready():
-    db.init_db()
-    try:
-        if GUILD_ID:
-            guild = discord.Object(id=int(GUILD_ID))
-            bot.tree.copy_global_to(guild=guild)
-            await bot.tree.sync(guild=guild)
-            print(f"Slash commands synced to guild {GUILD_ID}.")
-        else:
-            await bot.tree.sync()
-            print("Slash commands synced.")
-    except Exception as e:
-        print("Command sync error:", e)
+    global _synced
+    if not _synced:
+        try:
+            tree_hash = _tree_hash()
+            try:
+                stored = _CMD_HASH_PATH.read_text().strip()
+            except OSError:
+                stored = None
+            if stored == tree_hash:
+                print("Slash commands unchanged; skipping sync.")
+            elif GUILD_ID:
+                # Guild-scoped registration is instant; global sync can take
+                # up to an hour to propagate and is heavily rate-limited.
+                guild = discord.Object(id=int(GUILD_ID))
+                bot.tree.copy_global_to(guild=guild)
+                await bot.tree.sync(guild=guild)
+                print(f"Slash commands synced to guild {GUILD_ID}.")
+            else:
+                await bot.tree.sync()
+                print("Slash commands synced.")
+            if stored != tree_hash:
+                _CMD_HASH_PATH.write_text(tree_hash)
+            _synced = True
+        except Exception as e:
+            print("Command sync error:", e)
     print(f"Logged in as {bot.user}")
 
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    _officer_role_ids.pop(after.guild.id, None)
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    _officer_role_ids.pop(role.guild.id, None)
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    _officer_role_ids.pop(role.guild.id, None)
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: Exception):
+    if isinstance(error, app_commands.CheckFailure):
+        # officer_check rejection — expected, not an error worth logging
+        try:
+            await interaction.response.send_message("Officers only (PD/President).", ephemeral=True)
+        except Exception:
+            pass
+        return
     print("APP CMD ERROR:", repr(error))
     try:
         if interaction.response.is_done():
@@ -92,103 +219,96 @@ async def sync(interaction: discord.Interaction):
 # ---------- COMMANDS: Classes & Roster ----------
 @bot.tree.command(name="add_class", description="(Officers) Add a class.")
 @app_commands.describe(name="Class name", order_index="Display order (lower = earlier)")
+@defer_first()
+@officer_check()
 async def add_class(interaction: discord.Interaction, name: str, order_index: int):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     try:
-        db.add_class(name, order_index)
-        await interaction.response.send_message(f"Class **{name}** added (order {order_index}).", ephemeral=True)
+        await asyncio.to_thread(db.add_class, name, order_index)
+        await interaction.followup.send(f"Class **{name}** added (order {order_index}).", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="remove_class", description="(Officers) Remove a class (and all members in it).")
 @app_commands.describe(name="Class name")
+@defer_first()
+@officer_check()
 async def remove_class(interaction: discord.Interaction, name: str):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     try:
-        db.remove_class(name)
-        await interaction.response.send_message(f"Class **{name}** removed.", ephemeral=True)
+        await asyncio.to_thread(db.remove_class, name)
+        await interaction.followup.send(f"Class **{name}** removed.", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="classes", description="Show all classes (debug).")
+@defer_first()
 async def classes(interaction: discord.Interaction):
-    rows = db.list_classes()
-    if not rows:
-        await interaction.response.send_message("No classes in DB.", ephemeral=True); return
-    msg = "\n".join(f"{i}. **{name}** (order {ordx})" for i, (cid, name, ordx) in enumerate(rows, 1))
-    await interaction.response.send_message(msg, ephemeral=True)
+    global _classes_cache
+    ver = db.get_roster_version()
+    if _classes_cache and _classes_cache[0] == ver:
+        msg = _classes_cache[1]
+    else:
+        rows = await asyncio.to_thread(db.list_classes)
+        if not rows:
+            await interaction.followup.send("No classes in DB.", ephemeral=True); return
+        msg = "\n".join(f"{i}. **{name}** (order {ordx})" for i, (cid, name, ordx) in enumerate(rows, 1))
+        _classes_cache = (ver, msg)
+    await interaction.followup.send(msg, ephemeral=True)
 
 @bot.tree.command(name="add_member", description="(Officers) Add a member to a class.")
 @app_commands.describe(class_name="Class name", first_name="First", last_name="Last", nickname="Nickname", bio="Optional bio")
+@defer_first()
+@officer_check()
 async def add_member(interaction: discord.Interaction, class_name: str, first_name: str, last_name: str, nickname: str, bio: str | None = None):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     try:
-        rn = db.add_member(class_name, first_name, last_name, nickname, bio=bio)
-        await interaction.response.send_message(f"Added **#{rn} Mr. {first_name} “{nickname}” {last_name}** to {class_name}.", ephemeral=True)
+        rn = await asyncio.to_thread(db.add_member, class_name, first_name, last_name, nickname, bio=bio)
+        await interaction.followup.send(f"Added **#{rn} Mr. {first_name} “{nickname}” {last_name}** to {class_name}.", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="remove_member", description="(Officers) Remove a member by nickname.")
 @app_commands.describe(nickname="Nickname")
+@defer_first()
+@officer_check()
 async def remove_member(interaction: discord.Interaction, nickname: str):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
-    db.remove_member(nickname)
-    await interaction.response.send_message(f"Removed **{nickname}**.", ephemeral=True)
+    await asyncio.to_thread(db.remove_member, nickname)
+    await interaction.followup.send(f"Removed **{nickname}**.", ephemeral=True)
 
 @bot.tree.command(name="roster", description="Show the roster (optionally for a single class).")
 @app_commands.describe(class_name="If provided, shows only this class.")
 async def roster(interaction: discord.Interaction, class_name: str | None = None):
     await interaction.response.defer(thinking=True)
     try:
-        if class_name:
-            rows = db.get_class_roster(class_name)  # (first, nick, last, roll, honor)
+        ver = db.get_roster_version()
+        cached = _roster_cache.get(class_name)
+        if cached and cached[0] == ver:
+            final = [discord.Embed.from_dict(d) for d in cached[1]]
+        elif class_name:
+            rows = await asyncio.to_thread(db.get_class_roster, class_name)  # (first, nick, last, roll, honor)
             if not rows:
                 await interaction.followup.send(f"No members found for **{class_name}**.", ephemeral=True); return
             lines = [format_member_line_colored(f, n, l, r, h) for (f, n, l, r, h) in rows]
-            desc = "```ansi\n" + "\n".join(lines) + "\n```"
-            await interaction.followup.send(embed=discord.Embed(title=class_name, description=desc))
-            return
+            # single %-format over one join: two allocations for the block
+            desc = "```ansi\n%s\n```" % "\n".join(lines)
+            final = [discord.Embed(title=class_name, description=desc)]
+            _roster_cache[class_name] = (ver, [e.to_dict() for e in final])
+        else:
+            rows = await asyncio.to_thread(db.get_roster)  # (class, first, nick, last, roll, honor)
+            if not rows:
+                await interaction.followup.send("No classes yet. Ask an officer to add some or import.", ephemeral=True); return
 
-        rows = db.get_roster()  # (class, first, nick, last, roll, honor)
-        if not rows:
-            await interaction.followup.send("No classes yet. Ask an officer to add some or import.", ephemeral=True); return
-
-        embeds, cur_class, buf = [], None, []
-        def push():
-            nonlocal buf, cur_class, embeds
-            if cur_class is None: return
-            desc = "```ansi\n" + ("\n".join(buf) if buf else "No members yet") + "\n```"
-            embeds.append(discord.Embed(title=cur_class, description=desc))
-            buf = []
-
-        for cls, first, nick, last, roll, honor in rows:
-            if cls != cur_class:
-                push(); cur_class = cls
-            if first is not None:
-                buf.append(format_member_line_colored(first, nick, last, roll, honor))
-        push()
-
-        final = []
-        for e in embeds:
-            d = e.description or ""
-            if len(d) <= 5500:
-                final.append(e); continue
-            lines = d.strip("`ansi\n").strip("`").splitlines()
-            chunk = []
-            for ln in lines:
-                if len("\n".join(chunk + [ln])) > 5400:
-                    final.append(discord.Embed(title=e.title, description="```ansi\n" + "\n".join(chunk) + "\n```"))
-                    chunk = []
-                chunk.append(ln)
-            if chunk:
-                final.append(discord.Embed(title=e.title, description="```ansi\n" + "\n".join(chunk) + "\n```"))
-
-        for i in range(0, len(final), 10):
-            await interaction.followup.send(embeds=final[i:i+10])
+            final = list(_iter_roster_embeds(rows))
+            _roster_cache[None] = (ver, [e.to_dict() for e in final])
+
+        pages = [final[i:i+10] for i in range(0, len(final), 10)]
+        # Send the first page alone so auth/permission failures surface, then
+        # overlap the rest (discord.py's ratelimiter still paces the bucket).
+        await interaction.followup.send(embeds=pages[0])
+        if len(pages) > 1:
+            try:
+                await asyncio.gather(*(interaction.followup.send(embeds=p) for p in pages[1:]))
+            except discord.HTTPException:
+                for p in pages[1:]:
+                    await interaction.followup.send(embeds=p)
 
     except Exception as err:
         print("Roster failed:", repr(err))
@@ -197,80 +317,80 @@ async def roster(interaction: discord.Interaction, class_name: str | None = None
 # ---------- COMMANDS: Family & Socials ----------
 @bot.tree.command(name="set_big", description="(Officers) Set a member's big (nickname).")
 @app_commands.describe(nickname="Member", big_nickname="Big (empty to clear)")
+@defer_first()
+@officer_check()
 async def set_big(interaction: discord.Interaction, nickname: str, big_nickname: str | None = None):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     try:
-        db.set_big(nickname, big_nickname)
+        await asyncio.to_thread(db.set_big, nickname, big_nickname)
         msg = f"Set **{nickname}**'s big to **{big_nickname}**." if big_nickname else f"Cleared big for **{nickname}**."
-        await interaction.response.send_message(msg, ephemeral=True)
+        await interaction.followup.send(msg, ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="set_social", description="(Officers) Set a social handle.")
 @app_commands.describe(nickname="Member nickname", platform="instagram/x/linkedin/other", handle="Handle or URL")
+@defer_first()
+@officer_check()
 async def set_social(interaction: discord.Interaction, nickname: str, platform: str, handle: str):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     try:
-        db.set_social(nickname, platform, handle)
-        await interaction.response.send_message(f"Set {platform} for **{nickname}**.", ephemeral=True)
+        await asyncio.to_thread(db.set_social, nickname, platform, handle)
+        await interaction.followup.send(f"Set {platform} for **{nickname}**.", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="remove_social", description="(Officers) Remove a social handle.")
 @app_commands.describe(nickname="Member nickname", platform="Platform")
+@defer_first()
+@officer_check()
 async def remove_social(interaction: discord.Interaction, nickname: str, platform: str):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
-    db.remove_social(nickname, platform)
-    await interaction.response.send_message(f"Removed {platform} for **{nickname}**.", ephemeral=True)
+    await asyncio.to_thread(db.remove_social, nickname, platform)
+    await interaction.followup.send(f"Removed {platform} for **{nickname}**.", ephemeral=True)
 
 # ---------- COMMANDS: Skipped numbers ----------
 @bot.tree.command(name="skip_number", description="(Officers) Mark a roll number as skipped (blackballed).")
 @app_commands.describe(number="Number to skip")
+@defer_first()
+@officer_check()
 async def skip_number(interaction: discord.Interaction, number: int):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
-    db.add_skipped_number(number)
-    await interaction.response.send_message(f"Roll number **#{number}** marked as skipped.", ephemeral=True)
+    await asyncio.to_thread(db.add_skipped_number, number)
+    await interaction.followup.send(f"Roll number **#{number}** marked as skipped.", ephemeral=True)
 
 @bot.tree.command(name="unskip_number", description="(Officers) Remove a number from skipped list.")
 @app_commands.describe(number="Number to unskip")
+@defer_first()
+@officer_check()
 async def unskip_number(interaction: discord.Interaction, number: int):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
-    db.remove_skipped_number(number)
-    await interaction.response.send_message(f"Roll number **#{number}** unskipped.", ephemeral=True)
+    await asyncio.to_thread(db.remove_skipped_number, number)
+    await interaction.followup.send(f"Roll number **#{number}** unskipped.", ephemeral=True)
 
 # ---------- COMMANDS: Display-only reordering (OFFICERS ONLY) ----------
 @bot.tree.command(name="swap_display", description="(Officers) Swap two brothers' display positions (numbers stay the same).")
 @app_commands.describe(number_a="Roll number of first brother", number_b="Roll number of second brother")
+@defer_first()
+@officer_check()
 async def swap_display(interaction: discord.Interaction, number_a: int, number_b: int):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only (PD/President).", ephemeral=True); return
     try:
-        db.swap_display_positions(number_a, number_b)
-        await interaction.response.send_message(
+        await asyncio.to_thread(db.swap_display_positions, number_a, number_b)
+        await interaction.followup.send(
             f"Swapped display positions of **#{number_a}** and **#{number_b}** (roll numbers unchanged).",
             ephemeral=True
         )
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="move_display", description="(Officers) Move a brother to appear right AFTER another (numbers stay the same).")
 @app_commands.describe(number="Brother to move (roll number)", target_after="Place him after this roll number")
+@defer_first()
+@officer_check()
 async def move_display(interaction: discord.Interaction, number: int, target_after: int):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only (PD/President).", ephemeral=True); return
     try:
-        db.move_display_after(number, target_after)
-        await interaction.response.send_message(
+        await asyncio.to_thread(db.move_display_after, number, target_after)
+        await interaction.followup.send(
             f"Moved **#{number}** to appear after **#{target_after}** (roll numbers unchanged).",
             ephemeral=True
         )
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 # ---------- COMMANDS: Profiles / Names (OFFICERS ONLY) ----------
 @bot.tree.command(name="edit_name", description="(Officers) Edit a member's name fields.")
@@ -281,21 +401,21 @@ async def move_display(interaction: discord.Interaction, number: int, target_aft
     new_nickname="New nickname (optional)",
     honorific="Honorific (e.g., Mr., Ms., Mx.) (optional)"
 )
+@defer_first()
+@officer_check()
 async def edit_name(interaction: discord.Interaction,
                     nickname: str,
                     first_name: str | None = None,
                     last_name: str | None = None,
                     new_nickname: str | None = None,
                     honorific: str | None = None):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only (PD/President).", ephemeral=True); return
     try:
-        db.update_member_name(nickname, first_name=first_name, last_name=last_name,
-                              new_nickname=new_nickname, honorific=honorific)
+        await asyncio.to_thread(db.update_member_name, nickname, first_name=first_name,
+                                last_name=last_name, new_nickname=new_nickname, honorific=honorific)
         new_n = new_nickname if new_nickname else nickname
-        await interaction.response.send_message(f"Updated name for **{new_n}**.", ephemeral=True)
+        await interaction.followup.send(f"Updated name for **{new_n}**.", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 @bot.tree.command(name="edit_profile", description="(Officers) Edit profile fields (any subset).")
 @app_commands.describe(
@@ -303,35 +423,34 @@ async def edit_name(interaction: discord.Interaction,
     major="Major", age="Age", ethnicity="Ethnicity",
     hometown="Hometown", discord_handle="Discord handle (e.g., @user)"
 )
+@defer_first()
+@officer_check()
 async def edit_profile(interaction: discord.Interaction, nickname: str,
                        major: str | None = None, age: int | None = None,
                        ethnicity: str | None = None, hometown: str | None = None,
                        discord_handle: str | None = None):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only (PD/President).", ephemeral=True); return
     try:
-        db.update_member_profile(nickname, major=major, age=age, ethnicity=ethnicity,
-                                 hometown=hometown, discord_handle=discord_handle)
-        await interaction.response.send_message(f"Updated profile for **{nickname}**.", ephemeral=True)
+        await asyncio.to_thread(db.update_member_profile, nickname, major=major, age=age,
+                                ethnicity=ethnicity, hometown=hometown, discord_handle=discord_handle)
+        await interaction.followup.send(f"Updated profile for **{nickname}**.", ephemeral=True)
     except Exception as e:
-        await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+        await interaction.followup.send(f"Error: {e}", ephemeral=True)
 
 # ---------- COMMANDS: Lookup (PUBLIC) ----------
 @bot.tree.command(name="lookup", description="Find a brother by number, name, or nickname.")
 @app_commands.describe(number="Roll number", first="First name", nick="Nickname", last="Last name")
+@defer_first(ephemeral=False)
 async def lookup(interaction: discord.Interaction,
                  number: int | None = None, first: str | None = None,
                  nick: str | None = None, last: str | None = None):
-    # PUBLIC (not ephemeral)
-    await interaction.response.defer(ephemeral=False)
-
-    matches = db.lookup_members(first=first, last=last, nick=nick, number=number)
-    if not matches:
+    # One query fetches the full card for every match, so neither the
+    # single-match path nor the Select callback has to go back to the DB.
+    cards = await asyncio.to_thread(db.lookup_member_cards, first=first, last=last, nick=nick, number=number)
+    if not cards:
         await interaction.followup.send("No matching brothers found.")
         return
 
-    def build_embed(roll, f, n, l, classname):
-        info = db.get_member_card_by({"number": roll})
+    def build_embed(info: dict) -> discord.Embed:
         title_line = format_member_line_colored(info["first"], info["nick"], info["last"], info["roll"], info["honor"])
         ansi_title = "```ansi\n" + title_line + "\n```"
 
@@ -363,71 +482,103 @@ async def lookup(interaction: discord.Interaction,
                           description=ansi_title + "\n" + "\n".join(lines))
         return e
 
-    if len(matches) == 1:
-        r, f, n, l, classname = matches[0]
-        await interaction.followup.send(embed=build_embed(r, f, n, l, classname))
+    if len(cards) == 1:
+        await interaction.followup.send(embed=build_embed(cards[0]))
         return
 
-    options = [SelectOption(label=f"#{r} {f} “{n}” {l} — {classname}", value=str(r)) for (r, f, n, l, classname) in matches]
+    cards_by_roll = {c["roll"]: c for c in cards}
 
     class PickBrother(Select):
-        def __init__(self):
+        def __init__(self, options: list[SelectOption]):
             super().__init__(placeholder="Select a brother", options=options, min_values=1, max_values=1)
 
         async def callback(self, select_interaction: discord.Interaction):
-            chosen_roll = int(self.values[0])
-            r, f, n, l, classname = next(t for t in matches if t[0] == chosen_roll)
-            await select_interaction.response.edit_message(embed=build_embed(r, f, n, l, classname), view=None)
-
-    view = View()
-    view.add_item(PickBrother())
-    await interaction.followup.send("Multiple matches found. Please choose:", view=view)
+            info = cards_by_roll[int(self.values[0])]
+            await select_interaction.response.edit_message(embed=build_embed(info), view=None)
+
+    # A Select holds at most 25 options; paginate larger match lists instead
+    # of letting the view constructor raise.
+    for i in range(0, len(cards), 25):
+        chunk = cards[i:i+25]
+        options = [SelectOption(label=f"#{c['roll']} {c['first']} “{c['nick']}” {c['last']} — {c['class']}", value=str(c["roll"]))
+                   for c in chunk]
+        view = View()
+        view.add_item(PickBrother(options))
+        header = "Multiple matches found. Please choose:" if i == 0 else f"More matches ({i + 1}–{i + len(chunk)}):"
+        await interaction.followup.send(header, view=view)
 
 # ---------- IMPORT / EXPORT (Officers) ----------
+def _parse_roster_upload(buf: io.BytesIO, ext: str) -> pd.DataFrame:
+    """Blocking parse of an uploaded roster; runs in a worker thread."""
+    import pandas as pd
+    if ext in (".xlsx", ".xls"):
+        # calamine (Rust) parses xlsx far faster than openpyxl; fall back
+        # if python-calamine isn't installed. Prefer the "Contact" sheet.
+        for engine in ("calamine", None):
+            try:
+                try:
+                    return pd.read_excel(buf, sheet_name="Contact", engine=engine)
+                except ImportError:
+                    raise
+                except Exception:
+                    buf.seek(0)
+                    xls = pd.ExcelFile(buf, engine=engine)
+                    return pd.read_excel(xls, sheet_name=xls.sheet_names[0])
+            except ImportError:
+                buf.seek(0)
+    try:
+        return pd.read_csv(buf, engine="pyarrow")
+    except (ImportError, ValueError):
+        buf.seek(0)
+        return pd.read_csv(buf)
+
+def _write_roster_xlsx(df: pd.DataFrame, target) -> None:
+    """Stream the export through openpyxl's write-only mode: rows go straight
+    to the file instead of materializing a full workbook via df.to_excel."""
+    import pandas as pd
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Roster")
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([None if pd.isna(v) else v for v in row])
+    wb.save(target)
+
+
 @bot.tree.command(name="import_roster", description="(Officers) Import roster from an Excel/CSV attachment (Contact sheet).")
 @app_commands.describe(file="Attach .xlsx or .csv", clear_existing="Erase current DB first", create_missing="Create members that are not found", default_class="Class name for newly created members")
+@officer_check()
 async def import_roster(interaction: discord.Interaction,
                         file: discord.Attachment,
                         clear_existing: bool = False,
                         create_missing: bool = True,
                         default_class: str = "Imported"):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     await interaction.response.defer(ephemeral=True, thinking=True)
     try:
         ext = os.path.splitext(file.filename)[1].lower()
         if ext not in (".xlsx",".xls",".csv"):
             await interaction.followup.send("Please upload a .xlsx, .xls, or .csv file.", ephemeral=True); return
-        temp_path = f"/data/_import{ext}"
-        data = await file.read()
-        with open(temp_path, "wb") as f:
-            f.write(data)
-
-        if ext in (".xlsx",".xls"):
-            # Prefer "Contact" sheet; fallback to first sheet if not found
-            try:
-                df = pd.read_excel(temp_path, sheet_name="Contact")
-            except Exception:
-                xls = pd.ExcelFile(temp_path)
-                df = pd.read_excel(temp_path, sheet_name=xls.sheet_names[0])
-        else:
-            df = pd.read_csv(temp_path)
+        # Attachment.read is already async; the CPU-bound parse goes to a
+        # worker thread so a big sheet can't stall the event loop.
+        buf = io.BytesIO(await file.read())
+        df = await asyncio.to_thread(_parse_roster_upload, buf, ext)
 
-        db.import_roster_dataframe(df, clear_existing=clear_existing, create_missing=create_missing, default_class=default_class)
+        await asyncio.to_thread(db.import_roster_dataframe, df, clear_existing=clear_existing,
+                                create_missing=create_missing, default_class=default_class)
         await interaction.followup.send("Roster imported successfully ✅", ephemeral=True)
     except Exception as e:
         await interaction.followup.send(f"Import error: {e}", ephemeral=True)
 
 @bot.tree.command(name="export_roster", description="(Officers) Export the roster as an Excel file.")
+@officer_check()
 async def export_roster(interaction: discord.Interaction):
-    if not await is_pd_or_president(interaction):
-        await interaction.response.send_message("Officers only.", ephemeral=True); return
     await interaction.response.defer(ephemeral=True, thinking=True)
     try:
-        df = db.export_roster_dataframe()
-        out_path = "/data/roster_export.xlsx"
-        df.to_excel(out_path, index=False)
-        await interaction.followup.send(file=discord.File(out_path, filename="roster_export.xlsx"), ephemeral=True)
+        df = await asyncio.to_thread(db.export_roster_dataframe)
+        buf = io.BytesIO()
+        await asyncio.to_thread(_write_roster_xlsx, df, buf)
+        buf.seek(0)
+        await interaction.followup.send(file=discord.File(buf, filename="roster_export.xlsx"), ephemeral=True)
     except Exception as e:
         await interaction.followup.send(f"Export error: {e}", ephemeral=True)
 
@@ -435,4 +586,5 @@ async def export_roster(interaction: discord.Interaction):
 if __name__ == "__main__":
     if not TOKEN:
         raise RuntimeError("DISCORD_TOKEN is not set")
+    db.init_db()  # schema ready before the gateway connect even starts
     bot.run(TOKEN)
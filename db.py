@@ -1,123 +1,217 @@
 # db.py — SQLite storage and Excel import/export for the fraternity bot.
 
+from __future__ import annotations
+
+import array
+import atexit
+import json
 import os
 import re
 import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, Iterable
 
-import pandas as pd
-
 # On Railway, mount a volume at /data and set DB_PATH=/data/roster.sqlite3
 DB_PATH = Path(os.environ.get("DB_PATH", "roster.sqlite3"))
 
 # ---------- connection ----------
+_local = threading.local()
+
 def _conn() -> sqlite3.Connection:
-    cx = sqlite3.connect(DB_PATH)
+    """Connection for the calling thread, opened once per thread.
+
+    bot.py calls into here from asyncio.to_thread worker threads; giving each
+    thread its own connection keeps transactions private to their thread (a
+    shared connection would interleave concurrent commands' statements into
+    one another's transactions). WAL lets the per-thread connections read
+    concurrently while one writes; writers queue on busy_timeout.
+    check_same_thread=False only so atexit can close them from the main
+    thread — each connection is otherwise used solely by its owner."""
+    cx = getattr(_local, "cx", None)
+    if cx is None:
+        # cached_statements keeps the compiled VDBE programs for our hot
+        # statements resident (default is 128; imports can exceed that).
+        # isolation_level=None: sqlite3 never opens implicit DEFERRED
+        # transactions; single statements autocommit and multi-statement
+        # writers take the write lock up front via _tx().
+        cx = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256,
+                             isolation_level=None)
+        # WAL lets /roster and /lookup read concurrently with officer writes;
+        # the rest keeps more of the DB resident (20MB page cache, mmap'd
+        # reads, in-memory temp tables) so roster scans stay off the disk.
+        cx.execute("PRAGMA journal_mode=WAL")
+        cx.execute("PRAGMA synchronous=NORMAL")
+        cx.execute("PRAGMA cache_size=-20000")
+        cx.execute("PRAGMA mmap_size=268435456")
+        cx.execute("PRAGMA temp_store=MEMORY")
+        cx.execute("PRAGMA foreign_keys=ON")
+        cx.execute("PRAGMA busy_timeout=5000")
+        atexit.register(cx.close)
+        _local.cx = cx
     return cx
 
+@contextmanager
+def _tx(cx: sqlite3.Connection):
+    """Explicit BEGIN IMMEDIATE…COMMIT around multi-statement writes: the
+    write lock is taken once at the start (no mid-transaction lock upgrade)
+    and the whole batch costs a single fsync.
+
+    cx must be the calling thread's own connection (what _conn() returns) —
+    the bare BEGIN/COMMIT/ROLLBACK here would corrupt another thread's
+    in-flight transaction if connections were ever shared again."""
+    cx.execute("BEGIN IMMEDIATE")
+    try:
+        yield cx
+    except BaseException:
+        cx.execute("ROLLBACK")
+        raise
+    cx.execute("COMMIT")
+
+# ---------- data version ----------
+# Monotonic counter bumped by every mutating call. bot.py keys its rendered
+# reply caches on this so they invalidate on any write.
+_data_version = 0
+
+def _bump_version() -> None:
+    global _data_version
+    _data_version += 1
+
+def get_roster_version() -> int:
+    return _data_version
+
 # ---------- schema ----------
-def _add_column_if_missing(table: str, col: str, decl: str):
-    with _conn() as cx:
-        cols = [r[1] for r in cx.execute(f"PRAGMA table_info({table})").fetchall()]
-        if col not in cols:
-            cx.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
-            cx.commit()
+_initialized = False
 
 def init_db() -> None:
+    # Idempotent and guarded: bot.py calls this both before bot.run (so the
+    # schema exists prior to connecting) and from setup_hook as a safety net.
+    global _initialized
+    if _initialized:
+        return
+    # One executescript call creates the whole schema — a single Python to
+    # SQLite boundary crossing instead of ten.
+    _conn().executescript("""
+        -- Classes (pledge classes) — ordered globally
+        CREATE TABLE IF NOT EXISTS classes(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            order_index INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS ix_classes_order ON classes(order_index);
+
+        -- Members (join_order is REAL so we can place 0.5 then renormalize)
+        CREATE TABLE IF NOT EXISTS members(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            class_id     INTEGER NOT NULL,
+            first_name   TEXT    NOT NULL COLLATE NOCASE,
+            last_name    TEXT    NOT NULL COLLATE NOCASE,
+            nickname     TEXT    NOT NULL COLLATE NOCASE,
+            join_order   REAL    NOT NULL,
+            roll_number  INTEGER UNIQUE,
+            honorific    TEXT NOT NULL DEFAULT 'Mr.',
+            bio          TEXT,
+
+            -- profile core (old fields)
+            major        TEXT,
+            age          INTEGER,
+            ethnicity    TEXT,
+            hometown     TEXT,
+            discord_handle TEXT,
+
+            -- NEW: from Excel Contact sheet
+            phone        TEXT,
+            su_email     TEXT,
+            personal_email TEXT,
+            su_id        TEXT,
+            standing     TEXT,
+            shirt_size   TEXT,
+            birthday     TEXT,        -- store as text YYYY-MM-DD or raw
+            lineage      TEXT,        -- family line label (NOT big nickname)
+            personality16 TEXT,
+            love_language TEXT,
+            fascination_advantage TEXT,
+            notes        TEXT,
+            interest     TEXT,
+
+            FOREIGN KEY(class_id) REFERENCES classes(id) ON DELETE CASCADE,
+            UNIQUE(class_id, nickname)
+        );
+
+        -- Socials
+        CREATE TABLE IF NOT EXISTS member_socials(
+            member_id INTEGER NOT NULL,
+            platform  TEXT    NOT NULL,
+            handle    TEXT    NOT NULL,
+            PRIMARY KEY(member_id, platform),
+            FOREIGN KEY(member_id) REFERENCES members(id) ON DELETE CASCADE
+        );
+
+        -- Family (big/little via reverse lookup of 'big_id')
+        CREATE TABLE IF NOT EXISTS family(
+            member_id INTEGER PRIMARY KEY,
+            big_id    INTEGER,
+            FOREIGN KEY(member_id) REFERENCES members(id) ON DELETE CASCADE,
+            FOREIGN KEY(big_id)    REFERENCES members(id) ON DELETE SET NULL
+        );
+
+        -- Skipped/blackballed roll numbers
+        CREATE TABLE IF NOT EXISTS skipped_numbers(
+            roll_number INTEGER PRIMARY KEY
+        );
+
+        -- Lookup-path indexes. roll_number is already covered by its UNIQUE
+        -- constraint and member_socials by its (member_id, platform) PK.
+        CREATE INDEX IF NOT EXISTS ix_members_nickname_nocase ON members(nickname COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS ix_members_first_nocase ON members(first_name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS ix_members_last_nocase ON members(last_name COLLATE NOCASE);
+        -- (class_id, join_order) serves get_class_roster / get_roster with an
+        -- index-ordered scan; family(big_id) serves the littles subquery.
+        CREATE INDEX IF NOT EXISTS ix_members_class ON members(class_id, join_order);
+        CREATE INDEX IF NOT EXISTS ix_family_big ON family(big_id);
+    """)
+
+    # Idempotent adds (future safe): one table_info scan, then only the
+    # ALTERs that are actually needed, on the same connection.
     with _conn() as cx:
-        # Classes (pledge classes) — ordered globally
-        cx.execute("""
-            CREATE TABLE IF NOT EXISTS classes(
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                order_index INTEGER NOT NULL
-            );
-        """)
-
-        # Members (join_order is REAL so we can place 0.5 then renormalize)
-        cx.execute("""
-            CREATE TABLE IF NOT EXISTS members(
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                class_id     INTEGER NOT NULL,
-                first_name   TEXT    NOT NULL,
-                last_name    TEXT    NOT NULL,
-                nickname     TEXT    NOT NULL,
-                full_name    TEXT,
-                join_order   REAL    NOT NULL,
-                roll_number  INTEGER UNIQUE,
-                honorific    TEXT NOT NULL DEFAULT 'Mr.',
-                bio          TEXT,
-
-                -- profile core (old fields)
-                major        TEXT,
-                age          INTEGER,
-                ethnicity    TEXT,
-                hometown     TEXT,
-                discord_handle TEXT,
-
-                -- NEW: from Excel Contact sheet
-                phone        TEXT,
-                su_email     TEXT,
-                personal_email TEXT,
-                su_id        TEXT,
-                standing     TEXT,
-                shirt_size   TEXT,
-                birthday     TEXT,        -- store as text YYYY-MM-DD or raw
-                lineage      TEXT,        -- family line label (NOT big nickname)
-                personality16 TEXT,
-                love_language TEXT,
-                fascination_advantage TEXT,
-                notes        TEXT,
-                interest     TEXT,
-
-                FOREIGN KEY(class_id) REFERENCES classes(id),
-                UNIQUE(class_id, nickname)
-            );
-        """)
+        have = {r[1] for r in cx.execute("PRAGMA table_info(members)").fetchall()}
+        if "full_name" in have:
+            # legacy stored column; it is derivable from first/last and no
+            # longer written, so drop it where the runtime allows (3.35+)
+            try:
+                cx.execute("ALTER TABLE members DROP COLUMN full_name")
+            except sqlite3.OperationalError:
+                pass
+        for col, decl in [
+            ("major","TEXT"),("age","INTEGER"),("ethnicity","TEXT"),("hometown","TEXT"),("discord_handle","TEXT"),
+            ("phone","TEXT"),("su_email","TEXT"),("personal_email","TEXT"),("su_id","TEXT"),("standing","TEXT"),
+            ("shirt_size","TEXT"),("birthday","TEXT"),("lineage","TEXT"),("personality16","TEXT"),
+            ("love_language","TEXT"),("fascination_advantage","TEXT"),("notes","TEXT"),("interest","TEXT"),
+        ]:
+            if col not in have:
+                cx.execute(f"ALTER TABLE members ADD COLUMN {col} {decl}")
+    _initialized = True
 
-        # Socials
-        cx.execute("""
-            CREATE TABLE IF NOT EXISTS member_socials(
-                member_id INTEGER NOT NULL,
-                platform  TEXT    NOT NULL,
-                handle    TEXT    NOT NULL,
-                PRIMARY KEY(member_id, platform),
-                FOREIGN KEY(member_id) REFERENCES members(id)
-            );
-        """)
-
-        # Family (big/little via reverse lookup of 'big_id')
-        cx.execute("""
-            CREATE TABLE IF NOT EXISTS family(
-                member_id INTEGER PRIMARY KEY,
-                big_id    INTEGER,
-                FOREIGN KEY(member_id) REFERENCES members(id),
-                FOREIGN KEY(big_id)    REFERENCES members(id)
-            );
-        """)
-
-        # Skipped/blackballed roll numbers
-        cx.execute("""
-            CREATE TABLE IF NOT EXISTS skipped_numbers(
-                roll_number INTEGER PRIMARY KEY
-            );
-        """)
+# ---------- helpers ----------
+# Hot helper statements as module constants: identical string objects hit
+# sqlite3's per-connection statement cache without re-parsing.
+_SQL_CLASS_ID = "SELECT id FROM classes WHERE name=?"
+_SQL_MEMBER_ID_BY_NICK = "SELECT id FROM members WHERE nickname = ? COLLATE NOCASE"
 
-    # Idempotent adds (future safe)
-    for col, decl in [
-        ("major","TEXT"),("age","INTEGER"),("ethnicity","TEXT"),("hometown","TEXT"),("discord_handle","TEXT"),
-        ("phone","TEXT"),("su_email","TEXT"),("personal_email","TEXT"),("su_id","TEXT"),("standing","TEXT"),
-        ("shirt_size","TEXT"),("birthday","TEXT"),("lineage","TEXT"),("personality16","TEXT"),
-        ("love_language","TEXT"),("fascination_advantage","TEXT"),("notes","TEXT"),("interest","TEXT"),
-    ]:
-        _add_column_if_missing("members", col, decl)
+# name -> id memo: classes change rarely but every add_member resolves one.
+# remove_class is the only call that can invalidate an entry.
+_class_ids: dict[str, int] = {}
 
-# ---------- helpers ----------
 def _class_id(name: str) -> Optional[int]:
-    with _conn() as cx:
-        row = cx.execute("SELECT id FROM classes WHERE name=?", (name,)).fetchone()
-        return row[0] if row else None
+    cid = _class_ids.get(name)
+    if cid is None:
+        row = _conn().execute(_SQL_CLASS_ID, (name,)).fetchone()
+        if row is None:
+            return None
+        cid = _class_ids[name] = row[0]
+    return cid
 
 def _ensure_class(name: str) -> int:
     cid = _class_id(name)
@@ -126,51 +220,47 @@ def _ensure_class(name: str) -> int:
     with _conn() as cx:
         next_idx = cx.execute("SELECT COALESCE(MAX(order_index), 0) + 1 FROM classes").fetchone()[0]
         cx.execute("INSERT INTO classes(name, order_index) VALUES(?,?)", (name.strip(), next_idx))
-        cx.commit()
     return _class_id(name)
 
 def _member_id_by_nick(nick: str) -> Optional[int]:
     with _conn() as cx:
-        row = cx.execute("SELECT id FROM members WHERE LOWER(nickname)=LOWER(?)", (nick,)).fetchone()
+        row = cx.execute(_SQL_MEMBER_ID_BY_NICK, (nick,)).fetchone()
         return row[0] if row else None
 
 # ---------- skipped numbers ----------
 def add_skipped_number(number: int):
-    with _conn() as cx:
-        cx.execute("INSERT OR IGNORE INTO skipped_numbers(roll_number) VALUES(?)", (number,))
-        cx.commit()
+    add_skipped_numbers((number,))
+
+def add_skipped_numbers(numbers: Iterable[int]):
+    """Seed many blackballed numbers in one transaction."""
+    with _conn() as cx, _tx(cx):
+        cx.executemany("INSERT OR IGNORE INTO skipped_numbers(roll_number) VALUES(?)",
+                       ((int(n),) for n in numbers))
+    _bump_version()
 
 def remove_skipped_number(number: int):
     with _conn() as cx:
         cx.execute("DELETE FROM skipped_numbers WHERE roll_number=?", (number,))
-        cx.commit()
+    _bump_version()
 
-def get_skipped_numbers() -> list[int]:
+def get_skipped_numbers() -> array.array:
+    """Sorted blackballed numbers as a packed int array (4 bytes/entry
+    instead of a boxed PyLong each; iterates and indexes like a list)."""
     with _conn() as cx:
-        rows = cx.execute("SELECT roll_number FROM skipped_numbers ORDER BY roll_number ASC").fetchall()
-    return [r[0] for r in rows]
-
-# ---------- roll numbering ----------
-def _next_roll_number() -> int:
-    """Next roll number (start at #2), skip blackballed."""
-    with _conn() as cx:
-        last = cx.execute("SELECT MAX(roll_number) FROM members").fetchone()[0]
-        if last is None:
-            last = 1
-        skipped = {r[0] for r in cx.execute("SELECT roll_number FROM skipped_numbers").fetchall()}
-        n = last + 1
-        while n in skipped:
-            n += 1
-        return n
+        return array.array("i", (n for (n,) in
+            cx.execute("SELECT roll_number FROM skipped_numbers ORDER BY roll_number ASC")))
 
 # ---------- classes ----------
 def add_class(name: str, order_index: int) -> None:
     with _conn() as cx:
         cx.execute("INSERT INTO classes(name, order_index) VALUES(?, ?)", (name.strip(), order_index))
-        cx.commit()
+    _bump_version()
 
 def remove_class(name: str) -> None:
-    with _conn() as cx:
+    # Fresh schemas cascade from the classes delete alone; the explicit
+    # child deletes stay for databases created before the ON DELETE clauses
+    # (they are no-ops once the cascade has run).
+    with _conn() as cx, _tx(cx):
         cx.execute("""
             DELETE FROM member_socials
             WHERE member_id IN (
@@ -188,36 +278,84 @@ def remove_class(name: str) -> None:
         """, (name, name))
         cx.execute("DELETE FROM members WHERE class_id=(SELECT id FROM classes WHERE name=?)", (name,))
         cx.execute("DELETE FROM classes WHERE name=?", (name,))
-        cx.commit()
+    _class_ids.pop(name, None)
+    _bump_version()
 
 def list_classes() -> Iterable[tuple[int, str, int]]:
     with _conn() as cx:
         return cx.execute("SELECT id, name, order_index FROM classes ORDER BY order_index ASC").fetchall()
 
 # ---------- members ----------
+_SQL_ADD_MEMBER = """
+    INSERT INTO members(class_id, first_name, last_name, nickname, join_order, roll_number, bio)
+    SELECT :cid, :first, :last, :nick,
+           COALESCE((SELECT MAX(join_order) FROM members WHERE class_id=:cid), 0) + 1,
+           (WITH RECURSIVE c(n) AS (
+                SELECT COALESCE((SELECT MAX(roll_number) FROM members), 1) + 1
+                UNION ALL
+                SELECT n + 1 FROM c WHERE n IN (SELECT roll_number FROM skipped_numbers)
+            ) SELECT MAX(n) FROM c),
+           :bio
+    RETURNING roll_number
+"""
+
 def add_member(class_name: str, first_name: str, last_name: str, nickname: str, bio: Optional[str] = None) -> int:
     cid = _ensure_class(class_name)
     first_name, last_name, nickname = first_name.strip(), last_name.strip(), nickname.strip()
+    # Single INSERT: join_order and the next (skip-aware) roll number are
+    # computed by subqueries and RETURNING hands the number straight back.
     with _conn() as cx:
-        join_order = cx.execute("SELECT COALESCE(MAX(join_order), 0) + 1 FROM members WHERE class_id=?", (cid,)).fetchone()[0]
-        roll_number = _next_roll_number()
-        full = f"{first_name} {last_name}"
-        cx.execute("""
-            INSERT INTO members(class_id, first_name, last_name, nickname, full_name, join_order, roll_number, bio)
-            VALUES(?,?,?,?,?,?,?,?)
-        """, (cid, first_name, last_name, nickname, full, join_order, roll_number, bio))
-        cx.commit()
-        return roll_number
+        (roll_number,) = cx.execute(_SQL_ADD_MEMBER, {
+            "cid": cid, "first": first_name, "last": last_name,
+            "nick": nickname, "bio": bio,
+        }).fetchone()
+    _bump_version()
+    return roll_number
+
+def add_members_bulk(class_name: str, people: Iterable[tuple]) -> list[int]:
+    """Insert many members in one transaction. people is an iterable of
+    (first, last, nickname) or (first, last, nickname, bio) tuples; returns
+    the assigned roll numbers in order. One MAX scan and one skipped-set
+    load replace the per-member queries of repeated add_member calls."""
+    cid = _ensure_class(class_name)
+    with _conn() as cx, _tx(cx):
+        join_order = cx.execute("SELECT COALESCE(MAX(join_order), 0) FROM members WHERE class_id=?", (cid,)).fetchone()[0]
+        roll = cx.execute("SELECT MAX(roll_number) FROM members").fetchone()[0] or 1
+        skipped = {r[0] for r in cx.execute("SELECT roll_number FROM skipped_numbers").fetchall()}
+        rows, rolls = [], []
+        for person in people:
+            first, last, nick = (s.strip() for s in person[:3])
+            bio = person[3] if len(person) > 3 else None
+            roll += 1
+            while roll in skipped:
+                roll += 1
+            join_order += 1
+            rows.append((cid, first, last, nick, join_order, roll, bio))
+            rolls.append(roll)
+        if rows:
+            cx.executemany("""
+                INSERT INTO members(class_id, first_name, last_name, nickname, join_order, roll_number, bio)
+                VALUES(?,?,?,?,?,?,?)
+            """, rows)
+    if rolls:
+        _bump_version()
+    return rolls
 
 def remove_member(nickname: str) -> None:
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        return
     with _conn() as cx:
-        cx.execute("DELETE FROM member_socials WHERE member_id=?", (mid,))
-        cx.execute("DELETE FROM family WHERE member_id=? OR big_id=?", (mid, mid))
-        cx.execute("DELETE FROM members WHERE id=?", (mid,))
-        cx.commit()
+        with _tx(cx):
+            cx.execute("""
+                DELETE FROM member_socials
+                WHERE member_id=(SELECT id FROM members WHERE nickname = ? COLLATE NOCASE)
+            """, (nickname,))
+            cx.execute("""
+                DELETE FROM family
+                WHERE member_id=(SELECT id FROM members WHERE nickname = ? COLLATE NOCASE)
+                   OR big_id=(SELECT id FROM members WHERE nickname = ? COLLATE NOCASE)
+            """, (nickname, nickname))
+            removed = cx.execute("DELETE FROM members WHERE nickname = ? COLLATE NOCASE", (nickname,)).rowcount
+    if removed:
+        _bump_version()
 
 # ---------- roster fetch ----------
 def get_roster():
@@ -226,7 +364,7 @@ def get_roster():
             SELECT c.name, m.first_name, m.nickname, m.last_name, m.roll_number, m.honorific
             FROM classes c
             LEFT JOIN members m ON m.class_id=c.id
-            ORDER BY c.order_index ASC, m.join_order ASC
+            ORDER BY c.order_index ASC, m.join_order ASC, m.id ASC
         """).fetchall()
     return rows
 
@@ -237,161 +375,207 @@ def get_class_roster(class_name: str):
             FROM members m
             JOIN classes c ON m.class_id=c.id
             WHERE c.name=?
-            ORDER BY m.join_order ASC
+            ORDER BY m.join_order ASC, m.id ASC
         """, (class_name,)).fetchall()
     return rows
 
 # ---------- lookup / card ----------
+# One fixed plan for every argument combination: NULL-guarded predicates
+# keep the statement cacheable instead of compiling 16 SQL variants.
+_SQL_LOOKUP_MEMBERS = """
+    SELECT m.roll_number, m.first_name, m.nickname, m.last_name, c.name
+    FROM members m JOIN classes c ON m.class_id=c.id
+    WHERE (:first IS NULL OR m.first_name = :first COLLATE NOCASE)
+      AND (:last  IS NULL OR m.last_name  = :last  COLLATE NOCASE)
+      AND (:nick  IS NULL OR m.nickname   = :nick  COLLATE NOCASE)
+      AND (:number IS NULL OR m.roll_number = :number)
+    ORDER BY m.roll_number ASC
+"""
+
 def lookup_members(first=None, last=None, nick=None, number=None):
-    q = ("SELECT m.roll_number, m.first_name, m.nickname, m.last_name, c.name "
-         "FROM members m JOIN classes c ON m.class_id=c.id WHERE 1=1")
-    args = []
-    if first:   q += " AND LOWER(m.first_name)=LOWER(?)"; args.append(first)
-    if last:    q += " AND LOWER(m.last_name)=LOWER(?)";  args.append(last)
-    if nick:    q += " AND LOWER(m.nickname)=LOWER(?)";   args.append(nick)
-    if number:  q += " AND m.roll_number=?";              args.append(number)
-    q += " ORDER BY m.roll_number ASC"
     with _conn() as cx:
-        return cx.execute(q, tuple(args)).fetchall()
+        return cx.execute(_SQL_LOOKUP_MEMBERS,
+                          {"first": first or None, "last": last or None,
+                           "nick": nick or None, "number": number or None}).fetchall()
+
+# Big, littles, and socials come back on the same row (JSON-aggregated)
+# so the whole card is one SQL round trip instead of four.
+# Column aliases match the card dict keys so sqlite3.Row + dict() builds the
+# card in C with no Python-side destructuring.
+_CARD_SELECT_BASE = """
+  SELECT m.first_name AS first, m.last_name AS last, m.nickname AS nick,
+         m.roll_number AS roll, m.honorific AS honor, m.bio,
+         c.name AS "class", m.major, m.age, m.ethnicity, m.hometown,
+         m.discord_handle AS discord,
+         m.phone, m.su_email, m.personal_email, m.su_id, m.standing, m.shirt_size,
+         m.birthday, m.lineage, m.personality16, m.love_language, m.fascination_advantage,
+         m.notes, m.interest,
+         (SELECT b.nickname FROM family f JOIN members b ON b.id=f.big_id WHERE f.member_id=m.id) AS big,
+         (SELECT json_group_object(s.platform, s.handle) FROM member_socials s WHERE s.member_id=m.id) AS socials,
+         (SELECT json_group_array(l.nickname) FROM family ff JOIN members l ON ff.member_id=l.id WHERE ff.big_id=m.id) AS littles
+  FROM members m JOIN classes c ON m.class_id=c.id
+  WHERE {where}
+"""
+
+_CARD_SELECT = _CARD_SELECT_BASE + "  LIMIT 1\n"
+
+_CARD_WHERE = {
+    "number": "m.roll_number = ?",
+    "first":  "m.first_name = ? COLLATE NOCASE",
+    "last":   "m.last_name = ? COLLATE NOCASE",
+    "nick":   "m.nickname = ? COLLATE NOCASE",
+}
+
+# One precompiled statement per single-field lookup (the common case from the
+# bot) so SQLite's statement cache reuses the plan; multi-field lookups fall
+# back to a dynamically built OR clause.
+_CARD_STMTS = {key: _CARD_SELECT.format(where=frag) for key, frag in _CARD_WHERE.items()}
 
 def get_member_card_by(fields: dict):
-    where, args = [], []
+    crit = []
     if fields.get("number") is not None:
-        where.append("m.roll_number = ?"); args.append(int(fields["number"]))
+        crit.append(("number", int(fields["number"])))
     if fields.get("first"):
-        where.append("LOWER(m.first_name) = LOWER(?)"); args.append(fields["first"])
+        crit.append(("first", fields["first"]))
     if fields.get("last"):
-        where.append("LOWER(m.last_name) = LOWER(?)"); args.append(fields["last"])
+        crit.append(("last", fields["last"]))
     if fields.get("nick"):
-        where.append("LOWER(m.nickname) = LOWER(?)"); args.append(fields["nick"])
-    if not where:
+        crit.append(("nick", fields["nick"]))
+    if not crit:
         return None
 
-    sql = f"""
-      SELECT m.id, m.first_name, m.last_name, m.nickname, m.roll_number, m.honorific, m.bio,
-             c.name, m.major, m.age, m.ethnicity, m.hometown, m.discord_handle,
-             m.phone, m.su_email, m.personal_email, m.su_id, m.standing, m.shirt_size,
-             m.birthday, m.lineage, m.personality16, m.love_language, m.fascination_advantage,
-             m.notes, m.interest
-      FROM members m JOIN classes c ON m.class_id=c.id
-      WHERE {' OR '.join(where)}
-      LIMIT 1
-    """
+    if len(crit) == 1:
+        sql, args = _CARD_STMTS[crit[0][0]], (crit[0][1],)
+    else:
+        sql = _CARD_SELECT.format(where=" OR ".join(_CARD_WHERE[k] for k, _ in crit))
+        args = tuple(v for _, v in crit)
     with _conn() as cx:
-        row = cx.execute(sql, tuple(args)).fetchone()
-        if not row:
-            return None
-        (mid, first, last, nick, roll, honor, bio, classname,
-         major, age, ethnicity, hometown, discord_handle,
-         phone, su_email, personal_email, su_id, standing, shirt_size,
-         birthday, lineage, personality16, love_language, fascination_advantage,
-         notes, interest) = row
-
-        socials = dict(cx.execute("SELECT platform, handle FROM member_socials WHERE member_id=?", (mid,)).fetchall())
-
-        big_row = cx.execute("SELECT big_id FROM family WHERE member_id=?", (mid,)).fetchone()
-        big = None
-        if big_row and big_row[0] is not None:
-            br = cx.execute("SELECT nickname FROM members WHERE id=?", (big_row[0],)).fetchone()
-            big = br[0] if br else None
-
-        littles = [r[0] for r in cx.execute("""
-            SELECT m.nickname FROM family f JOIN members m ON f.member_id=m.id
-            WHERE f.big_id=?
-        """, (mid,)).fetchall()]
-
-    return {
-        "first": first, "last": last, "nick": nick, "roll": roll, "honor": honor,
-        "class": classname, "bio": bio, "socials": socials,
-        "big": big, "littles": littles,
-        "major": major, "age": age, "ethnicity": ethnicity, "hometown": hometown, "discord": discord_handle,
-        "phone": phone, "su_email": su_email, "personal_email": personal_email, "su_id": su_id,
-        "standing": standing, "shirt_size": shirt_size, "birthday": birthday, "lineage": lineage,
-        "personality16": personality16, "love_language": love_language,
-        "fascination_advantage": fascination_advantage, "notes": notes, "interest": interest
-    }
+        cur = cx.execute(sql, args)
+        cur.row_factory = sqlite3.Row  # local to the card query; other fetches stay tuples
+        row = cur.fetchone()
+    return _card_from_row(row) if row else None
+
+def lookup_member_cards(first=None, last=None, nick=None, number=None) -> list[dict]:
+    """Full member cards for every match in one round trip (same filters as
+    lookup_members, AND-combined; no filters matches everyone) so callers
+    never re-query per match."""
+    crit = []
+    if first:             crit.append(("first", first))
+    if last:              crit.append(("last", last))
+    if nick:              crit.append(("nick", nick))
+    if number is not None: crit.append(("number", int(number)))
+    where = " AND ".join(_CARD_WHERE[k] for k, _ in crit) if crit else "1=1"
+    sql = _CARD_SELECT_BASE.format(where=where)
+    sql += "  ORDER BY m.roll_number ASC\n"
+    with _conn() as cx:
+        cur = cx.execute(sql, tuple(v for _, v in crit))
+        cur.row_factory = sqlite3.Row
+        rows = cur.fetchall()
+    return [_card_from_row(r) for r in rows]
+
+def _card_from_row(row: sqlite3.Row) -> dict:
+    card = dict(row)
+    card["socials"] = json.loads(card["socials"]) if card["socials"] else {}
+    card["littles"] = json.loads(card["littles"]) if card["littles"] else []
+    return card
 
 # ---------- profiles / socials / family ----------
 def update_member_profile(nickname: str,
                           major: str | None = None, age: int | None = None,
                           ethnicity: str | None = None, hometown: str | None = None,
                           discord_handle: str | None = None):
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        raise ValueError("Member not found.")
-    sets, args = [], []
-    if major is not None: sets.append("major=?"); args.append(major)
-    if age is not None: sets.append("age=?"); args.append(int(age))
-    if ethnicity is not None: sets.append("ethnicity=?"); args.append(ethnicity)
-    if hometown is not None: sets.append("hometown=?"); args.append(hometown)
-    if discord_handle is not None: sets.append("discord_handle=?"); args.append(discord_handle)
-    if not sets: return
-    args.append(mid)
+    # One fixed-shape statement (cache-friendly): COALESCE keeps the stored
+    # value wherever the caller passed None, and the nickname resolves inline.
     with _conn() as cx:
-        cx.execute(f"UPDATE members SET {', '.join(sets)} WHERE id=?", tuple(args))
-        cx.commit()
+        cur = cx.execute("""
+            UPDATE members SET
+                major          = COALESCE(?, major),
+                age            = COALESCE(?, age),
+                ethnicity      = COALESCE(?, ethnicity),
+                hometown       = COALESCE(?, hometown),
+                discord_handle = COALESCE(?, discord_handle)
+            WHERE nickname = ? COLLATE NOCASE
+        """, (major, int(age) if age is not None else None,
+              ethnicity, hometown, discord_handle, nickname))
+        if cur.rowcount == 0:
+            raise ValueError("Member not found.")
+    _bump_version()
 
 def update_member_name(nickname: str,
                        first_name: str | None = None,
                        last_name:  str | None = None,
                        new_nickname: str | None = None,
                        honorific: str | None = None):
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        raise ValueError("Member not found.")
+    # Same COALESCE pattern as update_member_profile: one fixed statement
+    # with the nickname resolved in the WHERE clause.
     with _conn() as cx:
-        cur = cx.execute("SELECT first_name, last_name FROM members WHERE id=?", (mid,)).fetchone()
-        cur_first, cur_last = cur[0], cur[1]
-        new_first = first_name if first_name is not None else cur_first
-        new_last  = last_name  if last_name  is not None else cur_last
-        new_full  = f"{new_first} {new_last}"
-        sets, args = [], []
-        if first_name is not None:  sets.append("first_name=?");  args.append(first_name)
-        if last_name  is not None:  sets.append("last_name=?");   args.append(last_name)
-        if new_nickname is not None: sets.append("nickname=?");   args.append(new_nickname)
-        if honorific is not None:   sets.append("honorific=?");   args.append(honorific)
-        if first_name is not None or last_name is not None:
-            sets.append("full_name=?"); args.append(new_full)
-        if not sets: return
-        args.append(mid)
-        cx.execute(f"UPDATE members SET {', '.join(sets)} WHERE id=?", tuple(args))
-        cx.commit()
+        cur = cx.execute("""
+            UPDATE members SET
+                first_name = COALESCE(:first, first_name),
+                last_name  = COALESCE(:last, last_name),
+                nickname   = COALESCE(:nick, nickname),
+                honorific  = COALESCE(:honor, honorific)
+            WHERE nickname = :old COLLATE NOCASE
+        """, {"first": first_name, "last": last_name, "nick": new_nickname,
+              "honor": honorific, "old": nickname})
+        if cur.rowcount == 0:
+            raise ValueError("Member not found.")
+    _bump_version()
 
 def set_social(nickname: str, platform: str, handle: str) -> None:
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        raise ValueError("Member not found.")
     with _conn() as cx:
-        cx.execute("""
+        cur = cx.execute("""
+            INSERT INTO member_socials(member_id, platform, handle)
+            SELECT id, ?, ? FROM members WHERE nickname = ? COLLATE NOCASE
+            ON CONFLICT(member_id, platform) DO UPDATE SET handle=excluded.handle
+        """, (platform.lower(), handle, nickname))
+        if cur.rowcount == 0:
+            raise ValueError("Member not found.")
+    _bump_version()
+
+def set_socials_bulk(triples: Iterable[tuple[str, str, str]]) -> None:
+    """Upsert many (nickname, platform, handle) socials in one transaction.
+    Rows whose nickname does not match any member are skipped silently."""
+    with _conn() as cx, _tx(cx):
+        cx.executemany("""
             INSERT INTO member_socials(member_id, platform, handle)
-            VALUES(?,?,?)
+            SELECT id, ?, ? FROM members WHERE nickname = ? COLLATE NOCASE
             ON CONFLICT(member_id, platform) DO UPDATE SET handle=excluded.handle
-        """, (mid, platform.lower(), handle))
-        cx.commit()
+        """, ((platform.lower(), handle, nick) for nick, platform, handle in triples))
+    _bump_version()
 
 def remove_social(nickname: str, platform: str) -> None:
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        return
     with _conn() as cx:
-        cx.execute("DELETE FROM member_socials WHERE member_id=? AND platform=?", (mid, platform.lower()))
-        cx.commit()
+        cx.execute("""
+            DELETE FROM member_socials
+            WHERE member_id=(SELECT id FROM members WHERE nickname = ? COLLATE NOCASE)
+              AND platform=?
+        """, (nickname, platform.lower()))
+    _bump_version()
 
 def set_big(nickname: str, big_nickname: Optional[str]) -> None:
-    mid = _member_id_by_nick(nickname)
-    if mid is None:
-        raise ValueError("Member not found.")
-    bid = None
-    if big_nickname:
-        bid = _member_id_by_nick(big_nickname)
-        if bid is None:
-            raise ValueError("Big not found.")
+    # Both nicknames resolve inside the upsert; the extra lookups only run
+    # on the failure path to report which name was wrong.
     with _conn() as cx:
-        cx.execute("""
-            INSERT INTO family(member_id, big_id) VALUES(?,?)
-            ON CONFLICT(member_id) DO UPDATE SET big_id=excluded.big_id
-        """, (mid, bid))
-        cx.commit()
+        if big_nickname:
+            cur = cx.execute("""
+                INSERT INTO family(member_id, big_id)
+                SELECT m.id, b.id
+                FROM members m JOIN members b ON b.nickname = ? COLLATE NOCASE
+                WHERE m.nickname = ? COLLATE NOCASE
+                ON CONFLICT(member_id) DO UPDATE SET big_id=excluded.big_id
+            """, (big_nickname, nickname))
+        else:
+            cur = cx.execute("""
+                INSERT INTO family(member_id, big_id)
+                SELECT id, NULL FROM members WHERE nickname = ? COLLATE NOCASE
+                ON CONFLICT(member_id) DO UPDATE SET big_id=excluded.big_id
+            """, (nickname,))
+        if cur.rowcount == 0:
+            if _member_id_by_nick(nickname) is None:
+                raise ValueError("Member not found.")
+            raise ValueError("Big not found.")
+    _bump_version()
 
 # ---------- display-only reordering ----------
 def _member_core_by_roll(roll_number: int):
@@ -402,15 +586,33 @@ def _member_core_by_roll(roll_number: int):
         ).fetchone()
         return row
 
-def _renormalize_join_order(class_id: int):
-    with _conn() as cx:
-        rows = cx.execute(
-            "SELECT id FROM members WHERE class_id=? ORDER BY join_order ASC, id ASC",
-            (class_id,)
-        ).fetchall()
-        for i, (mid,) in enumerate(rows, start=1):
-            cx.execute("UPDATE members SET join_order=? WHERE id=?", (i, mid))
-        cx.commit()
+_SQL_RENORMALIZE = """
+    UPDATE members SET join_order = (
+        SELECT rn FROM (
+            SELECT id, row_number() OVER (ORDER BY join_order ASC, id ASC) AS rn
+            FROM members WHERE class_id=:cid
+        ) s WHERE s.id = members.id)
+    WHERE class_id=:cid
+"""
+
+def _renormalize_join_order(class_id: int, cx: sqlite3.Connection | None = None):
+    """Rewrite a class's join_order back to 1..N in one windowed UPDATE.
+    Pass cx to run inside a caller's open transaction."""
+    if cx is None:
+        cx = _conn()
+    cx.execute(_SQL_RENORMALIZE, {"cid": class_id})
+
+def _renormalize_all_join_orders():
+    """Partitioned variant of _renormalize_join_order: one UPDATE rewrites
+    join_order to 1..N within every class."""
+    _conn().execute("""
+        UPDATE members SET join_order = (
+            SELECT rn FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY class_id ORDER BY join_order ASC, id ASC) AS rn
+                FROM members
+            ) s WHERE s.id = members.id)
+    """)
 
 def swap_display_positions(number_a: int, number_b: int):
     a = _member_core_by_roll(number_a)
@@ -422,11 +624,13 @@ def swap_display_positions(number_a: int, number_b: int):
     if a_cid != b_cid:
         raise ValueError("Members must be in the same class to swap display positions.")
     with _conn() as cx:
-        cx.execute("UPDATE members SET join_order=? WHERE id=?", (-1, a_id))
-        cx.execute("UPDATE members SET join_order=? WHERE id=?", (a_ord, b_id))
-        cx.execute("UPDATE members SET join_order=? WHERE id=?", (b_ord, a_id))
-        cx.commit()
-    _renormalize_join_order(a_cid)
+        # join_order has no UNIQUE constraint, so both rows can swap in one
+        # CASE UPDATE — no sentinel value, no renormalize pass needed.
+        cx.execute("""
+            UPDATE members SET join_order = CASE id WHEN ? THEN ? WHEN ? THEN ? END
+            WHERE id IN (?, ?)
+        """, (a_id, b_ord, b_id, a_ord, a_id, b_id))
+    _bump_version()
 
 def move_display_after(number: int, target_after: int):
     src = _member_core_by_roll(number)
@@ -437,10 +641,10 @@ def move_display_after(number: int, target_after: int):
     t_id, t_cid, t_ord, _ = tgt
     if s_cid != t_cid:
         raise ValueError("Members must be in the same class to move display order.")
-    with _conn() as cx:
+    with _conn() as cx, _tx(cx):
         cx.execute("UPDATE members SET join_order=? WHERE id=?", (t_ord + 0.5, s_id))
-        cx.commit()
-    _renormalize_join_order(s_cid)
+        _renormalize_join_order(s_cid, cx)
+    _bump_version()
 
 # ---------- Excel import/export ----------
 # Map your Contact sheet columns → DB fields (case-insensitive)
@@ -467,152 +671,194 @@ _CONTACT_MAP = {
     "16 personalities": "personality16",
 }
 
+_IMPORT_FIELDS = (
+    "first_name","last_name","nickname","phone","su_email","personal_email","su_id",
+    "standing","major","ethnicity","hometown","shirt_size","birthday","lineage",
+    "personality16","love_language","fascination_advantage","notes","interest")
+
+_NON_DIGIT = re.compile(r"\D")
+
 def _clean_phone(v):
-    if v is None or (isinstance(v, float) and pd.isna(v)): return None
-    s = str(v)
-    digits = re.sub(r"\D", "", s)
+    # NaN check without touching pandas (NaN != NaN)
+    if v is None or (isinstance(v, float) and v != v): return None
+    digits = _NON_DIGIT.sub("", str(v))
     if not digits: return None
     return digits
 
-def _normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
-    # Convert all column headers to lowercase and strip whitespace
-    df.columns = [str(c).strip().lower() for c in df.columns]
-    return df
-
 def import_roster_dataframe(df: pd.DataFrame, clear_existing: bool = False, create_missing: bool = True, default_class: str = "Imported"):
-    # Use Contact-like headers (case-insensitive)
-    df = _normalize_headers(df)
-    lower_cols = {c.lower(): c for c in df.columns}
+    _import_rows(list(df.columns), df.itertuples(index=False, name=None),
+                 clear_existing=clear_existing, create_missing=create_missing,
+                 default_class=default_class)
+
+def _import_rows(headers, rows, clear_existing: bool = False, create_missing: bool = True, default_class: str = "Imported"):
+    """Batched upsert from Contact-like headers plus an iterable of row tuples.
+
+    Shared by the DataFrame import and the streaming file import; the rows
+    iterable is consumed exactly once.
+    """
+    # Match Contact-like headers case-insensitively via a lookup map
+    # instead of rewriting the caller's header list.
+    lower_cols = {str(c).strip().lower(): c for c in headers}
 
     # Basic presence check
     required = {"first name", "last name", "nickname"}
     if not required.issubset(lower_cols.keys()):
         raise ValueError(f"Missing required columns: {required - set(lower_cols.keys())}")
 
-    if clear_existing:
-        with _conn() as cx:
+    # Which mapped fields this sheet actually carries — constant per import,
+    # so every UPDATE shares one SET clause and can go through executemany.
+    present = [(src_lower, field) for src_lower, field in _CONTACT_MAP.items() if src_lower in lower_cols]
+    update_fields = [f for _, f in present if f in _IMPORT_FIELDS]
+
+    cid_default = _ensure_class(default_class)
+
+    with _conn() as cx, _tx(cx):
+        if clear_existing:
             cx.execute("DELETE FROM member_socials")
             cx.execute("DELETE FROM family")
             cx.execute("DELETE FROM members")
-            cx.commit()
 
-    cid_default = _ensure_class(default_class)
-
-    with _conn() as cx:
-        for _, row in df.iterrows():
-            rec = {}
-            for src_lower, field in _CONTACT_MAP.items():
-                if src_lower in lower_cols:
-                    rec[field] = row[lower_cols[src_lower]]
-
-            first = str(rec.get("first_name") or row[lower_cols["first name"]]).strip()
-            last  = str(rec.get("last_name")  or row[lower_cols["last name"]]).strip()
-            nick  = str(rec.get("nickname")   or row[lower_cols["nickname"]]).strip()
+        skipped = {r[0] for r in cx.execute("SELECT roll_number FROM skipped_numbers").fetchall()}
+        next_roll = (cx.execute("SELECT MAX(roll_number) FROM members").fetchone()[0] or 1) + 1
+        next_jo = cx.execute("SELECT COALESCE(MAX(join_order), 0) + 1 FROM members WHERE class_id=?",
+                             (cid_default,)).fetchone()[0]
+
+        # Resolve every mapped header to a flat tuple index once, so the row
+        # loop does plain integer indexing instead of chained dict lookups.
+        col_pos = {c: i for i, c in enumerate(headers)}
+        field_columns = [(field, col_pos[lower_cols[src_lower]]) for src_lower, field in present]
+        i_first = col_pos[lower_cols["first name"]]
+        i_last  = col_pos[lower_cols["last name"]]
+        i_nick  = col_pos[lower_cols["nickname"]]
+        # Stage normalized rows in a TEMP table, then match and merge with
+        # set-based statements: the existing-member join runs in SQLite's C
+        # core instead of per-row Python dict probes. The TEMP table is
+        # transactional, so a rollback removes it too.
+        cols = ", ".join(_IMPORT_FIELDS)
+        cx.execute(f"CREATE TEMP TABLE imp({cols}, target_id INTEGER)")
+        staged = []
+        for row in rows:
+            rec = {field: row[i] for field, i in field_columns}
+
+            first = str(rec.get("first_name") or row[i_first]).strip()
+            last  = str(rec.get("last_name")  or row[i_last]).strip()
+            nick  = str(rec.get("nickname")   or row[i_nick]).strip()
             if not first or not last or not nick:
                 continue
 
-            phone = _clean_phone(rec.get("phone"))
-
-            # match existing by nickname OR (first+last)
-            existing = cx.execute("""
-                SELECT id, class_id FROM members
-                WHERE LOWER(nickname)=LOWER(?) OR (LOWER(first_name)=LOWER(?) AND LOWER(last_name)=LOWER(?))
-                LIMIT 1
-            """, (nick, first, last)).fetchone()
-
-            if existing:
-                mid, class_id = existing
-                sets, args = [], []
-                # Always keep full_name consistent
-                sets.append("full_name=?"); args.append(f"{first} {last}")
-                for k in ["first_name","last_name","nickname","phone","su_email","personal_email","su_id",
-                          "standing","major","ethnicity","hometown","shirt_size","birthday","lineage",
-                          "personality16","love_language","fascination_advantage","notes","interest"]:
-                    if k in rec:
-                        val = rec[k]
-                        sets.append(f"{k}=?"); args.append(val)
-                if phone is not None:
-                    sets.append("phone=?"); args.append(phone)
-                args.append(mid)
-                cx.execute(f"UPDATE members SET {', '.join(sets)} WHERE id=?", tuple(args))
-            else:
-                if not create_missing:
-                    continue
-                # create in default class with next roll number and appended join_order
-                jo = cx.execute("SELECT COALESCE(MAX(join_order), 0) + 1 FROM members WHERE class_id=?", (cid_default,)).fetchone()[0]
-                roll_number = _next_roll_number()
-                cx.execute("""
-                    INSERT INTO members(class_id, first_name, last_name, nickname, full_name,
-                                        join_order, roll_number,
-                                        phone, su_email, personal_email, su_id, standing,
-                                        major, ethnicity, hometown, shirt_size, birthday, lineage,
-                                        personality16, love_language, fascination_advantage, notes, interest,
-                                        honorific)
-                    VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """, (cid_default, first, last, nick, f"{first} {last}",
-                      jo, roll_number,
-                      phone, rec.get("su_email"), rec.get("personal_email"), rec.get("su_id"), rec.get("standing"),
-                      rec.get("major"), rec.get("ethnicity"), rec.get("hometown"), rec.get("shirt_size"),
-                      rec.get("birthday"), rec.get("lineage"),
-                      rec.get("personality16"), rec.get("love_language"), rec.get("fascination_advantage"),
-                      rec.get("notes"), rec.get("interest"),
-                      "Mr."))
-        cx.commit()
-
-    # Renormalize each class after bulk changes
-    with _conn() as cx:
-        cids = [r[0] for r in cx.execute("SELECT id FROM classes").fetchall()]
-    for cid in cids:
-        _renormalize_join_order(cid)
+            if "phone" in rec:
+                rec["phone"] = _clean_phone(rec["phone"])
+            rec["first_name"], rec["last_name"], rec["nickname"] = first, last, nick
+            staged.append(tuple(rec.get(k) for k in _IMPORT_FIELDS))
+        marks = ",".join("?" * len(_IMPORT_FIELDS))
+        cx.executemany(f"INSERT INTO imp({cols}) VALUES({marks})", staged)
+
+        # First occurrence wins on duplicate sheet nicknames
+        cx.execute("""
+            DELETE FROM imp WHERE rowid NOT IN
+                (SELECT MIN(rowid) FROM imp GROUP BY nickname COLLATE NOCASE)
+        """)
+        # Resolve each staged row against pre-import members (nickname first,
+        # then first+last) via the NOCASE indexes.
+        cx.execute("""
+            UPDATE imp SET target_id = COALESCE(
+                (SELECT id FROM members m WHERE m.nickname = imp.nickname COLLATE NOCASE),
+                (SELECT id FROM members m WHERE m.first_name = imp.first_name COLLATE NOCASE
+                                            AND m.last_name  = imp.last_name  COLLATE NOCASE))
+        """)
+        cx.execute("""
+            DELETE FROM imp WHERE target_id IS NOT NULL AND rowid NOT IN
+                (SELECT MIN(rowid) FROM imp WHERE target_id IS NOT NULL GROUP BY target_id)
+        """)
+
+        sets = ", ".join(f"{k}=imp.{k}" for k in update_fields)
+        cx.execute(f"UPDATE members SET {sets} FROM imp WHERE members.id = imp.target_id")
+
+        if create_missing:
+            n_new = cx.execute("SELECT COUNT(*) FROM imp WHERE target_id IS NULL").fetchone()[0]
+            if n_new:
+                # Pre-allocate the next n_new roll numbers, skipping retired ones
+                rolls = []
+                while len(rolls) < n_new:
+                    if next_roll not in skipped:
+                        rolls.append((len(rolls) + 1, next_roll))
+                    next_roll += 1
+                cx.execute("CREATE TEMP TABLE imp_rolls(k INTEGER PRIMARY KEY, roll INTEGER)")
+                cx.executemany("INSERT INTO imp_rolls VALUES(?,?)", rolls)
+                insel = ", ".join(f"i.{f}" for f in _IMPORT_FIELDS)
+                cx.execute(f"""
+                    INSERT INTO members(class_id, join_order, roll_number, honorific, {cols})
+                    SELECT ?, ? + r.k - 1, r.roll, 'Mr.', {insel}
+                    FROM (SELECT imp.*, ROW_NUMBER() OVER (ORDER BY imp.rowid) AS k
+                          FROM imp WHERE target_id IS NULL) AS i
+                    JOIN imp_rolls r ON r.k = i.k
+                """, (cid_default, next_jo))
+                cx.execute("DROP TABLE imp_rolls")
+        cx.execute("DROP TABLE imp")
+
+    # Renormalize every class in one partitioned UPDATE after bulk changes
+    _renormalize_all_join_orders()
+    _bump_version()
 
 def import_roster_from_path(path: str, **kwargs):
-    # Prefer "Contact" sheet; else fall back to first sheet for xlsx
+    # Stream rows straight into the batched upsert — no DataFrame intermediate.
     ext = Path(path).suffix.lower()
-    if ext in (".xlsx", ".xls"):
+    if ext == ".xlsx":
+        import openpyxl
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
         try:
-            df = pd.read_excel(path, sheet_name="Contact")
-        except Exception:
-            xls = pd.ExcelFile(path)
-            df = pd.read_excel(path, sheet_name=xls.sheet_names[0])
+            # Prefer "Contact" sheet; else fall back to the first sheet
+            ws = wb["Contact"] if "Contact" in wb.sheetnames else wb[wb.sheetnames[0]]
+            it = ws.iter_rows(values_only=True)
+            headers = next(it, None)
+            if headers is None:
+                raise ValueError("Empty sheet")
+            _import_rows(headers, it, **kwargs)
+        finally:
+            wb.close()
     elif ext == ".csv":
-        df = pd.read_csv(path)
+        import csv
+        with open(path, newline="", encoding="utf-8-sig") as fh:
+            reader = csv.reader(fh)
+            headers = next(reader, None)
+            if headers is None:
+                raise ValueError("Empty file")
+            _import_rows(headers, reader, **kwargs)
     else:
         raise ValueError("Unsupported file type. Use .xlsx or .csv")
-    import_roster_dataframe(df, **kwargs)
+
+_SQL_EXPORT_MEMBERS = """
+    SELECT m.roll_number, c.name AS class_name, m.first_name, m.nickname, m.last_name,
+           m.honorific, m.bio, m.major, m.age, m.ethnicity, m.hometown, m.discord_handle,
+           m.phone, m.su_email, m.personal_email, m.su_id, m.standing, m.shirt_size, m.birthday,
+           m.lineage, m.personality16, m.love_language, m.fascination_advantage, m.notes, m.interest,
+           m.id AS member_id
+    FROM members m JOIN classes c ON m.class_id=c.id
+    ORDER BY m.roll_number ASC
+"""
+
+def _export_lookup_maps(cx):
+    # Gather socials and bigs with two bulk queries instead of two per member
+    socials_map: dict[int, dict[str, str]] = defaultdict(dict)
+    for mid, platform, handle in cx.execute("SELECT member_id, platform, handle FROM member_socials"):
+        socials_map[mid][platform] = handle
+    bigs_map = dict(cx.execute(
+        "SELECT f.member_id, m.nickname FROM family f JOIN members m ON f.big_id=m.id"))
+    return socials_map, bigs_map
 
 def export_roster_dataframe() -> pd.DataFrame:
-    with _conn() as cx:
-        rows = cx.execute("""
-          SELECT m.roll_number, c.name as class_name, m.first_name, m.nickname, m.last_name,
-                 m.honorific, m.bio, m.major, m.age, m.ethnicity, m.hometown, m.discord_handle,
-                 m.phone, m.su_email, m.personal_email, m.su_id, m.standing, m.shirt_size, m.birthday,
-                 m.lineage, m.personality16, m.love_language, m.fascination_advantage, m.notes, m.interest,
-                 m.id
-          FROM members m JOIN classes c ON m.class_id=c.id
-          ORDER BY m.roll_number ASC
-        """).fetchall()
-    df = pd.DataFrame(rows, columns=[
-        "roll_number","class_name","first_name","nickname","last_name",
-        "honorific","bio","major","age","ethnicity","hometown","discord_handle",
-        "phone","su_email","personal_email","su_id","standing","shirt_size","birthday",
-        "lineage","personality16","love_language","fascination_advantage","notes","interest",
-        "member_id"
-    ])
-
-    # Gather socials and bigs
-    socials_instagram, socials_x, socials_linkedin, socials_other, bigs = [], [], [], [], []
-    with _conn() as cx:
-        for mid in df["member_id"].tolist():
-            s = dict(cx.execute("SELECT platform, handle FROM member_socials WHERE member_id=?", (mid,)).fetchall())
-            socials_instagram.append(s.get("instagram"))
-            socials_x.append(s.get("x"))
-            socials_linkedin.append(s.get("linkedin"))
-            socials_other.append(s.get("other"))
-            r = cx.execute(
-                "SELECT m.nickname FROM family f JOIN members m ON f.big_id=m.id WHERE f.member_id=?",
-                (mid,)
-            ).fetchone()
-            bigs.append(r[0] if r else None)
+    import pandas as pd
+    # read_sql_query builds the frame column-wise in C — no intermediate
+    # list of row tuples; the aliases double as the export column names.
+    df = pd.read_sql_query(_SQL_EXPORT_MEMBERS, _conn())
+    socials_map, bigs_map = _export_lookup_maps(_conn())
+
+    member_ids = df["member_id"].tolist()
+    bigs = [bigs_map.get(mid) for mid in member_ids]
+    socials_instagram = [socials_map[mid].get("instagram") for mid in member_ids]
+    socials_x        = [socials_map[mid].get("x") for mid in member_ids]
+    socials_linkedin = [socials_map[mid].get("linkedin") for mid in member_ids]
+    socials_other    = [socials_map[mid].get("other") for mid in member_ids]
 
     df.drop(columns=["member_id"], inplace=True)
     df["big_nickname"] = bigs
@@ -621,3 +867,25 @@ def export_roster_dataframe() -> pd.DataFrame:
     df["linkedin"] = socials_linkedin
     df["other"] = socials_other
     return df
+
+def export_roster_to_xlsx(path: str) -> None:
+    """Stream the roster straight from the cursor into a write-only workbook.
+
+    Skips the DataFrame round-trip of export_roster_dataframe; write-only
+    mode appends rows without allocating a Cell object per value.
+    """
+    import openpyxl
+    cx = _conn()
+    socials_map, bigs_map = _export_lookup_maps(cx)
+    cur = cx.execute(_SQL_EXPORT_MEMBERS)
+    headers = [d[0] for d in cur.description[:-1]] + [
+        "big_nickname", "instagram", "x", "linkedin", "other"]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Contact")
+    ws.append(headers)
+    for row in cur:
+        mid = row[-1]
+        s = socials_map[mid]
+        ws.append(row[:-1] + (bigs_map.get(mid), s.get("instagram"),
+                              s.get("x"), s.get("linkedin"), s.get("other")))
+    wb.save(path)